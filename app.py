@@ -1,7 +1,9 @@
 """
 AI Healthcare Coaching Platform - Streamlit Demo
 Installation: pip install streamlit pandas plotly
+Voice mode (optional): pip install vosk pyttsx3 and set VOSK_MODEL_PATH to a Vosk model
 Run: streamlit run app.py
+Benchmarks: pip install -r requirements-dev.txt && pytest
 """
 
 import streamlit as st
@@ -10,7 +12,14 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import time
-import random
+import uuid
+import wave
+
+from coaching_engine import personas, generate_ai_response, generate_ai_assessment
+from event_log import SessionEventLog
+from transcript_search import TranscriptSearchIndex
+from usage_ledger import TENANT_MONTHLY_BUDGETS, LEDGER_COLUMNS, UsageLedger
+from voice_pipeline import load_speech_model, load_speech_synthesizer, transcribe_stream, synthesize_stream, wav_duration
 
 # Page configuration
 st.set_page_config(
@@ -94,135 +103,298 @@ if 'session_complete' not in st.session_state:
     st.session_state.session_complete = False
 if 'ai_assessment' not in st.session_state:
     st.session_state.ai_assessment = None
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = None
+for field, default in {'rep': 'Demo Rep', 'team': 'Specialty Care East', 'tenant': 'demo-pharma'}.items():
+    if f'profile_{field}' not in st.session_state:
+        st.session_state[f'profile_{field}'] = default
+if 'last_submission' not in st.session_state:
+    st.session_state.last_submission = None
+if 'rerun_stats' not in st.session_state:
+    st.session_state.rerun_stats = {'app': 0, 'fragment': 0, 'app_at_fragment': 0, 'turns': 0, 'debounced': 0,
+                                    'app_at_start': 0, 'turns_at_start': 0}
+st.session_state.rerun_stats['app'] += 1
 
-# HCP Personas Data
-personas = {
-    "Dr. Sarah Chen": {
-        "specialty": "Cardiologist",
-        "experience": "15 years",
-        "personality": "Data-driven, skeptical of new treatments",
-        "context": "Busy practice, values efficiency",
-        "difficulty": "Hard",
-        "objections": ["Need more clinical data", "Current treatment works fine", "Cost concerns"],
-        "avatar": "👩‍⚕️"
-    },
-    "Dr. Michael Roberts": {
-        "specialty": "General Practitioner",
-        "experience": "8 years",
-        "personality": "Open to innovation, patient-focused",
-        "context": "Growing practice, interested in new solutions",
-        "difficulty": "Medium",
-        "objections": ["Patient acceptance", "Insurance coverage", "Training requirements"],
-        "avatar": "👨‍⚕️"
-    },
-    "Dr. Emily Watson": {
-        "specialty": "Oncologist",
-        "experience": "20 years",
-        "personality": "Conservative, evidence-based",
-        "context": "Academic hospital setting",
-        "difficulty": "Hard",
-        "objections": ["Peer-reviewed studies needed", "Hospital formulary process", "Side effect profile"],
-        "avatar": "👩‍⚕️"
-    }
-}
-
-# AI Response Generator
-def generate_ai_response(persona_name, user_message):
-    """Simulate AI responses based on persona"""
-    responses = [
-        "I appreciate the information, but I'd need to see more robust clinical trial data before considering this for my patients. What Phase III results do you have?",
-        "That's interesting. How does this compare to the current standard of care in terms of efficacy and safety profile?",
-        "I'm concerned about the cost. Many of my patients struggle with medication affordability. What patient assistance programs are available?",
-        "Can you walk me through the mechanism of action? I want to understand how this differs from existing treatments.",
-        "What's the evidence on long-term outcomes? I'm particularly interested in real-world data beyond the clinical trials.",
-        "I've had good results with the current treatment protocol. What would be the compelling reason for me to switch?",
-        "How does this fit into the current treatment guidelines? Has it been incorporated into any professional society recommendations?",
-        "What kind of monitoring is required? I need to understand the practical implications for my practice."
-    ]
-    return random.choice(responses)
-
-# AI Assessment Generator - Generic Assessment
-def generate_ai_assessment(messages, persona):
-    """Generate a generic comprehensive AI assessment"""
-    
-    # Fixed assessment scores for demo
-    base_scores = {
-        'Clinical Knowledge': 87,
-        'Rapport Building': 92,
-        'Objection Handling': 78,
-        'Value Communication': 85,
-        'Compliance & Ethics': 95
-    }
+@st.cache_resource
+def get_event_log():
+    return SessionEventLog()
+
+@st.cache_resource
+def get_search_index():
+    """Index rebuilt from the event log on a background thread; `ready` is set once caught up."""
+    index = TranscriptSearchIndex()
+    index.ready = get_event_log().replay_and_subscribe_in_background(index.add_event)
+    return index
+
+def log_session_event(event_type, payload=None):
+    """Record an event for the active session, if there is one."""
+    if st.session_state.session_id:
+        get_event_log().append(st.session_state.session_id, event_type, payload)
+
+# Usage Accounting - model calls per rep, team and persona against tenant budgets
+@st.cache_resource
+def get_usage_ledger():
+    """Ledger rebuilt from the event log on a background thread; `ready` is set once caught up."""
+    ledger = UsageLedger()
+    ledger.ready = get_event_log().replay_and_subscribe_in_background(ledger.add_event, event_types=("model_call",))
+    return ledger
+
+def tenant_budget_status():
+    """Budget state of the rep's tenant: 'ok', 'soft' (fast tier only) or 'blocked'."""
+    return get_usage_ledger().budget_status(st.session_state.profile_tenant)
+
+BUDGET_BLOCKED_MESSAGE = "🚫 Your organization's monthly model budget is used up - practice replies and assessments resume next month."
+
+def current_user_profile():
+    """Rep, team and tenant set in the sidebar; model calls are attributed to these."""
+    return {field: st.session_state[f'profile_{field}'] for field in ('rep', 'team', 'tenant')}
+
+def record_model_call(record, turn_started):
+    """Log a model call; latency_ms is engine time, turn_latency_ms what the rep waited."""
+    log_session_event("model_call", {
+        **current_user_profile(),
+        **record,
+        'turn_latency_ms': (time.perf_counter() - turn_started) * 1000
+    })
+
+# Start rebuilding search and usage history when the app loads, off the chat path
+get_search_index()
+get_usage_ledger()
+
+# Voice Role-Play - streaming local speech-to-text and text-to-speech
+@st.cache_resource
+def get_speech_model():
+    return load_speech_model()
+
+@st.cache_resource
+def get_speech_synthesizer():
+    return load_speech_synthesizer()
+
+def submit_voice_input():
+    """Voice recorder callback: queue the new recording for the chat fragment."""
+    recording = st.session_state.voice_input
+    if recording is not None:
+        st.session_state.pending_voice = recording.getvalue()
+
+def transcribe_voice_turn(wav_bytes):
+    """Show stabilized partial transcripts while a recording is recognized.
+
+    Partials are only displayed; the persona reply starts from the final
+    transcript. st.audio_input delivers the whole recording at once, so
+    decoding runs faster than real time and replying early would save nothing.
+    """
+    placeholder = st.empty()
+    text = ""
+    try:
+        for text, is_final in transcribe_stream(wav_bytes, get_speech_model()):
+            placeholder.markdown(f"🎙️ *{text}…*" if not is_final else f"🎙️ {text}")
+    except (ValueError, wave.Error) as e:
+        st.error(f"Could not process recording: {e}")
+        return ""
+    placeholder.empty()
+    return text
+
+def voice_latency_text(latency):
+    first_audio = f"{latency['first_audio']:.2f} s" if latency.get('first_audio') is not None else "–"
+    return (f"⏱️ Last voice turn: speech-to-text {latency['stt']:.2f} s • "
+            f"reply {latency['reply']:.2f} s • first audio sent {first_audio}")
+
+def play_reply(text, player, latency, latency_caption, started):
+    """Play the reply sentence by sentence as each one is synthesized.
+
+    Each clip replaces the previous one in `player` once it has finished
+    playing, and the next sentence is synthesized while the current one
+    plays. First-audio latency is taken when the first clip is sent.
+    """
+    engine = get_speech_synthesizer()
+    if engine is None:
+        return
+    playing_until = 0.0
+    for audio in synthesize_stream(text, engine):
+        time.sleep(max(0.0, playing_until - time.perf_counter()))
+        player.audio(audio, format="audio/wav", autoplay=True)
+        sent = time.perf_counter()
+        if latency.get('first_audio') is None:
+            latency['first_audio'] = sent - started
+            latency_caption.caption(voice_latency_text(latency))
+        playing_until = sent + wav_duration(audio)
+
+# Conversation Screen Fragments - header and chat rerun independently of the app
+INPUT_DEBOUNCE_SECONDS = 3.0
+
+def submit_user_input():
+    """Send button callback: queue the typed message once and clear the box.
+
+    The text is checked before the box is cleared: within the debounce window
+    a repeat click (which finds the box already empty) or the same message
+    sent again is ignored.
+    """
+    text = st.session_state.user_input.strip()
+    now = time.monotonic()
+    last = st.session_state.last_submission
+    st.session_state.user_input = ""
+    if last and text in ("", last[0]) and now - last[1] < INPUT_DEBOUNCE_SECONDS:
+        st.session_state.rerun_stats['debounced'] += 1
+        return
+    if not text:
+        return
+    st.session_state.last_submission = (text, now)
+    st.session_state.pending_input = text
+
+@st.fragment
+def render_conversation_header(persona_name):
+    persona = personas[persona_name]
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        st.markdown(f"### {persona['avatar']} {persona_name}")
+        st.caption(f"{persona['specialty']} • {persona['difficulty']} Difficulty")
     
-    overall_score = 87
-    weak_areas = ['Objection Handling']
-    strong_areas = ['Rapport Building', 'Compliance & Ethics']
-    
-    # Generic insights
-    insights = [
-        "🎯 **Objection Handling:** Practice preemptively addressing common objections before they're raised. Use the LAER model (Listen, Acknowledge, Explore, Respond).",
-        "💪 **Strong Rapport Building:** Excellent ability to establish trust and credibility quickly with healthcare professionals.",
-        "✅ **Compliance Excellence:** Outstanding adherence to regulatory and ethical guidelines throughout the conversation."
-    ]
-    
-    # LMS recommendations for weak areas
-    lms_recommendations = [
-        {
-            'title': 'LAER Objection Handling Framework',
-            'type': 'Interactive Module',
-            'duration': '60 min',
-            'priority': 'High',
-            'link': 'https://lms.example.com/laer-framework',
-            'description': 'Master the Listen-Acknowledge-Explore-Respond methodology with practice scenarios'
-        },
-        {
-            'title': 'Top 20 HCP Objections & Responses',
-            'type': 'Reference Guide',
-            'duration': '15 min',
-            'priority': 'High',
-            'link': 'https://lms.example.com/objection-library',
-            'description': 'Comprehensive library of proven responses to common objections'
-        },
-        {
-            'title': 'Advanced Objection Handling Role-Plays',
-            'type': 'Video Series',
-            'duration': '45 min',
-            'priority': 'Medium',
-            'link': 'https://lms.example.com/objection-videos',
-            'description': 'Watch expert sales reps handle difficult objections in real-world scenarios'
-        }
-    ]
-    
-    # Scenario recommendations
-    scenario_recommendations = [
-        {
-            'title': 'Deep Objection Handling Practice',
-            'difficulty': 'Intermediate-Advanced',
-            'description': 'Face 5+ consecutive objections from a highly skeptical HCP',
-            'personas': ['Dr. Sarah Chen', 'Dr. Emily Watson'],
-            'estimated_time': '15-20 min',
-            'skills_developed': ['Persistence', 'Objection reframing', 'Emotional resilience']
-        },
-        {
-            'title': 'Multi-Stakeholder Account Meeting',
-            'difficulty': 'Advanced',
-            'description': 'Navigate complex group dynamics with department heads, formulary committee members, and budget holders',
-            'personas': ['Chief of Cardiology', 'Pharmacy Director', 'CFO'],
-            'estimated_time': '25-30 min',
-            'skills_developed': ['Stakeholder management', 'Budget negotiation', 'Group influence']
-        }
-    ]
-    
-    return {
-        'overall_score': overall_score,
-        'category_scores': base_scores,
-        'weak_areas': weak_areas,
-        'strong_areas': strong_areas,
-        'insights': insights,
-        'lms_recommendations': lms_recommendations,
-        'scenario_recommendations': scenario_recommendations,
-        'skill_level_update': 'intermediate'
-    }
+    with col2:
+        if st.button("🔄 Switch Persona", use_container_width=True):
+            log_session_event("session_ended", {"reason": "switch_persona"})
+            st.session_state.conversation_active = False
+            st.session_state.messages = []
+            st.session_state.session_id = None
+            st.rerun()
+    
+    with col3:
+        budget_status = tenant_budget_status()
+        if st.button("✅ End Session", use_container_width=True, type="primary", disabled=budget_status == "blocked",
+                     help=BUDGET_BLOCKED_MESSAGE if budget_status == "blocked" else None):
+            # Generate AI assessment
+            turn_started = time.perf_counter()
+            with st.spinner("🤖 AI is analyzing your performance..."):
+                time.sleep(2)
+                st.session_state.ai_assessment = generate_ai_assessment(
+                    st.session_state.messages, 
+                    personas[st.session_state.selected_persona],
+                    persona_name=st.session_state.selected_persona,
+                    over_budget=budget_status == "soft",
+                    on_model_call=lambda record: record_model_call(record, turn_started)
+                )
+            log_session_event("assessment_produced", st.session_state.ai_assessment)
+            log_session_event("session_ended", {"reason": "completed"})
+            st.session_state.conversation_active = False
+            st.session_state.session_complete = True
+            st.rerun()
+
+@st.fragment
+def render_conversation(persona_name):
+    persona = personas[persona_name]
+    stats = st.session_state.rerun_stats
+    # Full-script runs bump 'app' first, so an unchanged count means only this fragment reran
+    if stats.get('app_at_fragment') == stats['app']:
+        stats['fragment'] += 1
+    stats['app_at_fragment'] = stats['app']
+    
+    # A queued message is answered before drawing so the transcript is current
+    user_input = st.session_state.pop('pending_input', None)
+    voice_audio = st.session_state.pop('pending_voice', None)
+    budget_status = tenant_budget_status()
+    if budget_status == "blocked":
+        # Hard limit: no model calls, so queued input is dropped rather than answered
+        user_input = voice_audio = None
+    spoken_reply = None
+    turn_started = time.perf_counter()
+    if voice_audio:
+        voice_started = turn_started
+        user_input = transcribe_voice_turn(voice_audio)
+        voice_latency = {'stt': time.perf_counter() - voice_started}
+    if user_input:
+        # Add user message
+        st.session_state.messages.append({
+            "role": "user",
+            "content": user_input,
+            "time": datetime.now()
+        })
+        log_session_event("message_sent", {"content": user_input})
+        
+        # Simulate AI thinking (skipped in voice mode to keep the turn under a second)
+        with st.spinner(f"{persona_name} is thinking..."):
+            if not voice_audio:
+                time.sleep(1.5)
+            ai_response = generate_ai_response(persona_name, user_input, over_budget=budget_status == "soft",
+                                               on_model_call=lambda record: record_model_call(record, turn_started))
+            st.session_state.messages.append({
+                "role": "ai",
+                "content": ai_response,
+                "time": datetime.now()
+            })
+        log_session_event("persona_reply", {"content": ai_response})
+        st.session_state.rerun_stats['turns'] += 1
+        
+        if voice_audio:
+            voice_latency['reply'] = time.perf_counter() - voice_started
+            st.session_state.voice_latency = voice_latency
+            spoken_reply = ai_response
+    
+    # Chat Container
+    chat_container = st.container()
+    
+    with chat_container:
+        for message in st.session_state.messages:
+            if message["role"] == "user":
+                st.markdown(f"""
+                <div class="chat-message-user">
+                    <strong>You:</strong><br>
+                    {message['content']}
+                    <div style="font-size: 0.75rem; opacity: 0.8; margin-top: 0.5rem;">
+                        {message['time'].strftime('%H:%M:%S')}
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="chat-message-ai">
+                    <strong>{persona['avatar']} {persona_name}:</strong><br>
+                    {message['content']}
+                    <div style="font-size: 0.75rem; opacity: 0.6; margin-top: 0.5rem;">
+                        {message['time'].strftime('%H:%M:%S')}
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    if budget_status == "blocked":
+        st.error(BUDGET_BLOCKED_MESSAGE)
+    
+    # Spoken persona reply, filled in at the end of the run
+    reply_player = st.empty()
+    
+    voice_available = get_speech_model() is not None
+    voice_mode = st.toggle("🎙️ Voice mode", key="voice_mode", disabled=not voice_available,
+                           help=None if voice_available else "Install vosk and set VOSK_MODEL_PATH to enable voice mode")
+    
+    # Input Area
+    st.markdown("<br>", unsafe_allow_html=True)
+    col1, col2 = st.columns([5, 1])
+    
+    with col1:
+        if voice_mode:
+            st.audio_input("Record your response", key="voice_input", on_change=submit_voice_input,
+                           disabled=budget_status == "blocked", label_visibility="collapsed")
+        else:
+            st.text_input("Type your response...", key="user_input", disabled=budget_status == "blocked",
+                          label_visibility="collapsed")
+    
+    with col2:
+        if not voice_mode:
+            st.button("📤 Send", use_container_width=True, type="primary", on_click=submit_user_input,
+                      disabled=budget_status == "blocked")
+    
+    latency_caption = st.empty()
+    if voice_mode and st.session_state.get('voice_latency'):
+        latency_caption.caption(voice_latency_text(st.session_state.voice_latency))
+    
+    # Rerun counter
+    turns = stats['turns'] - stats['turns_at_start']
+    full_runs = stats['app'] - stats['app_at_start']
+    per_turn = f"{full_runs / turns:.2f}" if turns else "–"
+    st.caption(f"🔁 Full-script reruns: {full_runs} • Chat-only reruns: {stats['fragment']} • "
+               f"Full reruns per turn: {per_turn} • Duplicate sends ignored: {stats['debounced']}")
+    
+    # Speak last so the transcript and input are on screen while the reply plays
+    if spoken_reply:
+        play_reply(spoken_reply, reply_player, voice_latency, latency_caption, voice_started)
 
 # Sidebar Navigation
 with st.sidebar:
@@ -231,18 +403,24 @@ with st.sidebar:
     
     if st.button("🏠 Dashboard", use_container_width=True, type="primary" if st.session_state.page == 'dashboard' else "secondary"):
         st.session_state.page = 'dashboard'
+        if st.session_state.conversation_active:
+            log_session_event("session_ended", {"reason": "navigation"})
         st.session_state.conversation_active = False
         st.session_state.session_complete = False
         st.rerun()
     
     if st.button("🎭 Practice Sessions", use_container_width=True, type="primary" if st.session_state.page == 'personas' else "secondary"):
         st.session_state.page = 'personas'
+        if st.session_state.conversation_active:
+            log_session_event("session_ended", {"reason": "navigation"})
         st.session_state.conversation_active = False
         st.session_state.session_complete = False
         st.rerun()
     
     if st.button("📊 Analytics", use_container_width=True, type="primary" if st.session_state.page == 'analytics' else "secondary"):
         st.session_state.page = 'analytics'
+        if st.session_state.conversation_active:
+            log_session_event("session_ended", {"reason": "navigation"})
         st.session_state.conversation_active = False
         st.session_state.session_complete = False
         st.rerun()
@@ -252,6 +430,12 @@ with st.sidebar:
     st.metric("Sessions Completed", "24", "+3")
     st.metric("Average Score", "86%", "+5%")
     st.metric("Practice Time", "12h", "+2h")
+    
+    st.markdown("---")
+    with st.expander("👤 Rep Profile"):
+        st.text_input("Rep", key="profile_rep")
+        st.text_input("Team", key="profile_team")
+        st.selectbox("Tenant", list(TENANT_MONTHLY_BUDGETS), key="profile_tenant")
 
 # DASHBOARD PAGE
 if st.session_state.page == 'dashboard':
@@ -385,9 +569,17 @@ elif st.session_state.page == 'personas':
                     if st.button(f"▶️ Start Session", key=f"start_{name}", use_container_width=True, type="primary"):
                         st.session_state.selected_persona = name
                         st.session_state.conversation_active = True
+                        st.session_state.session_id = uuid.uuid4().hex
+                        st.session_state.rerun_stats.update(
+                            app_at_start=st.session_state.rerun_stats['app'] + 1,
+                            turns_at_start=st.session_state.rerun_stats['turns'],
+                            fragment=0, debounced=0
+                        )
                         st.session_state.messages = [
                             {"role": "ai", "content": f"Good morning, I'm {name}. I understand you wanted to speak with me about a new treatment option? I have about 10 minutes before my next patient.", "time": datetime.now()}
                         ]
+                        log_session_event("session_started", {"persona": name})
+                        log_session_event("persona_reply", {"content": st.session_state.messages[0]["content"]})
                         st.rerun()
                 
                 st.markdown("<br>", unsafe_allow_html=True)
@@ -395,90 +587,10 @@ elif st.session_state.page == 'personas':
     # CONVERSATION SCREEN
     elif st.session_state.conversation_active:
         persona_name = st.session_state.selected_persona
-        persona = personas[persona_name]
-        
-        # Header
-        col1, col2, col3 = st.columns([2, 1, 1])
-        with col1:
-            st.markdown(f"### {persona['avatar']} {persona_name}")
-            st.caption(f"{persona['specialty']} • {persona['difficulty']} Difficulty")
-        
-        with col2:
-            if st.button("🔄 Switch Persona", use_container_width=True):
-                st.session_state.conversation_active = False
-                st.session_state.messages = []
-                st.rerun()
-        
-        with col3:
-            if st.button("✅ End Session", use_container_width=True, type="primary"):
-                # Generate AI assessment
-                with st.spinner("🤖 AI is analyzing your performance..."):
-                    time.sleep(2)
-                    st.session_state.ai_assessment = generate_ai_assessment(
-                        st.session_state.messages, 
-                        personas[st.session_state.selected_persona]
-                    )
-                st.session_state.conversation_active = False
-                st.session_state.session_complete = True
-                st.rerun()
         
+        render_conversation_header(persona_name)
         st.markdown("---")
-        
-        # Chat Container
-        chat_container = st.container()
-        
-        with chat_container:
-            for message in st.session_state.messages:
-                if message["role"] == "user":
-                    st.markdown(f"""
-                    <div class="chat-message-user">
-                        <strong>You:</strong><br>
-                        {message['content']}
-                        <div style="font-size: 0.75rem; opacity: 0.8; margin-top: 0.5rem;">
-                            {message['time'].strftime('%H:%M:%S')}
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="chat-message-ai">
-                        <strong>{persona['avatar']} {persona_name}:</strong><br>
-                        {message['content']}
-                        <div style="font-size: 0.75rem; opacity: 0.6; margin-top: 0.5rem;">
-                            {message['time'].strftime('%H:%M:%S')}
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-        # Input Area
-        st.markdown("<br>", unsafe_allow_html=True)
-        col1, col2 = st.columns([5, 1])
-        
-        with col1:
-            user_input = st.text_input("Type your response...", key="user_input", label_visibility="collapsed")
-        
-        with col2:
-            send_button = st.button("📤 Send", use_container_width=True, type="primary")
-        
-        if send_button and user_input:
-            # Add user message
-            st.session_state.messages.append({
-                "role": "user",
-                "content": user_input,
-                "time": datetime.now()
-            })
-            
-            # Simulate AI thinking
-            with st.spinner(f"{persona_name} is thinking..."):
-                time.sleep(1.5)
-                ai_response = generate_ai_response(persona_name, user_input)
-                st.session_state.messages.append({
-                    "role": "ai",
-                    "content": ai_response,
-                    "time": datetime.now()
-                })
-            
-            st.rerun()
+        render_conversation(persona_name)
     
     # RESULTS SCREEN WITH AI ASSESSMENT
     elif st.session_state.session_complete:
@@ -697,6 +809,7 @@ elif st.session_state.page == 'personas':
                 st.session_state.selected_persona = None
                 st.session_state.messages = []
                 st.session_state.ai_assessment = None
+                st.session_state.session_id = None
                 st.rerun()
         
         with col3:
@@ -706,6 +819,7 @@ elif st.session_state.page == 'personas':
                 st.session_state.selected_persona = None
                 st.session_state.messages = []
                 st.session_state.ai_assessment = None
+                st.session_state.session_id = None
                 st.rerun()
 
 # ANALYTICS PAGE
@@ -775,6 +889,128 @@ elif st.session_state.page == 'analytics':
         }
     )
     
+    # Model Usage & Cost
+    st.markdown("### 💰 Model Usage & Cost")
+    usage_ledger = get_usage_ledger()
+    if not usage_ledger.ready.is_set():
+        st.caption("⏳ Still loading usage history from the session log - figures below are partial.")
+    usage = pd.DataFrame(usage_ledger.snapshot(), columns=LEDGER_COLUMNS)
+    tenant = st.session_state.profile_tenant
+    budget = TENANT_MONTHLY_BUDGETS.get(tenant)
+    spend = usage_ledger.tenant_spend(tenant)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Spend This Month", f"${spend:,.2f}", delta=f"of ${budget:,.2f} budget" if budget else None, delta_color="off")
+    with col2:
+        st.metric("Tokens Used", f"{int(usage['input_tokens'].sum() + usage['output_tokens'].sum()):,}")
+    with col3:
+        fast_share = (usage['tier'] == 'fast').mean() * 100 if len(usage) else 0
+        st.metric("Routed to Fast Model", f"{fast_share:.0f}%")
+    with col4:
+        st.metric("Avg Turn Latency", f"{usage['turn_latency_ms'].mean() / 1000:.2f} s" if usage['turn_latency_ms'].notna().any() else "–",
+                  help="Time the rep waited for each reply or assessment, including the simulated thinking delay")
+    if budget:
+        st.progress(min(spend / budget, 1.0), text=f"{tenant} monthly budget")
+        budget_status = usage_ledger.budget_status(tenant)
+        if budget_status == "blocked":
+            st.error("🚫 Monthly budget reached - model calls are blocked until next month.")
+        elif budget_status == "soft":
+            st.warning(f"⚠️ Soft limit reached ({usage_ledger.soft_limit_fraction:.0%} of budget) - "
+                       "all calls are routed to the fast model until the budget is used up.")
+    
+    if len(usage):
+        per_session = usage.groupby('session_id').agg(
+            Persona=('persona', 'first'),
+            Rep=('rep', 'first'),
+            Started=('ts', 'min'),
+            Calls=('function', 'size'),
+            Tokens=('input_tokens', 'sum'),
+            Output=('output_tokens', 'sum'),
+            Cost=('cost', 'sum'),
+            TurnLatency=('turn_latency_ms', 'mean'),
+            EngineLatency=('latency_ms', 'mean')
+        ).reset_index().sort_values('Started', ascending=False)
+        per_session['Tokens'] += per_session.pop('Output')
+        per_session['Started'] = per_session['Started'].str[:16].str.replace('T', ' ')
+        per_session['Session'] = per_session.pop('session_id').str[:8]
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            group_by = st.selectbox("Group cost by", ["persona", "rep", "team", "model"])
+            cost_by_group = usage.groupby(group_by, as_index=False)['cost'].sum()
+            fig_cost = px.bar(cost_by_group, x=group_by, y='cost', labels={'cost': 'Cost ($)', group_by: group_by.capitalize()})
+            fig_cost.update_traces(marker_color='#3b82f6')
+            fig_cost.update_layout(height=300)
+            st.plotly_chart(fig_cost, use_container_width=True)
+        with col2:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.dataframe(
+                per_session[['Session', 'Started', 'Persona', 'Rep', 'Calls', 'Tokens', 'Cost', 'TurnLatency', 'EngineLatency']],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Cost": st.column_config.NumberColumn("Cost", format="$%.4f"),
+                    "TurnLatency": st.column_config.NumberColumn("Avg Turn Latency", format="%.0f ms"),
+                    "EngineLatency": st.column_config.NumberColumn("Avg Engine Latency", format="%.3f ms")
+                }
+            )
+    else:
+        st.caption("No model calls recorded yet - complete a practice session to see usage.")
+    
+    # Transcript Search
+    st.markdown("### 🔍 Search Past Transcripts")
+    search_index = get_search_index()
+    if not search_index.ready.is_set():
+        st.caption("⏳ Still indexing past transcripts - results may be incomplete.")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        search_query = st.text_input("Search transcripts", placeholder="e.g. cost concerns, hospital formulary process", label_visibility="collapsed")
+    with col2:
+        search_modes = ["Keyword", "Similar wording"] if search_index.similar_wording else ["Keyword"]
+        search_mode = st.selectbox("Mode", search_modes, label_visibility="collapsed")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        search_personas = st.multiselect("Persona", list(personas.keys()))
+    with col2:
+        search_role = st.selectbox("Speaker", ["Anyone", "Rep", "HCP"])
+    with col3:
+        search_dates = st.date_input("Date range", value=(datetime.now().date() - timedelta(days=90), datetime.now().date()))
+    with col4:
+        search_min_score = st.slider("Minimum score", 0, 100, 0)
+    
+    if search_query:
+        start_date, end_date = (search_dates + (None,))[:2] if isinstance(search_dates, tuple) else (search_dates, None)
+        search_started = time.perf_counter()
+        results = search_index.search(
+            search_query,
+            mode=search_mode.lower(),
+            personas=search_personas or None,
+            start_date=start_date,
+            end_date=end_date,
+            min_score=search_min_score or None,
+            role={"Rep": "user", "HCP": "ai"}.get(search_role)
+        )
+        search_ms = (time.perf_counter() - search_started) * 1000
+        st.caption(f"{len(results)} matches in {search_ms:.1f} ms across {len(search_index.messages):,} messages")
+        
+        if results:
+            rows = []
+            for relevance, message_id in results:
+                session_id, role, content, ts = search_index.messages[message_id]
+                session = search_index.sessions.get(session_id, {})
+                rows.append({
+                    'Date': ts[:16].replace('T', ' '),
+                    'Persona': session.get('persona'),
+                    'Speaker': 'Rep' if role == 'user' else 'HCP',
+                    'Message': content,
+                    'Session Score': session.get('score'),
+                    'Relevance': round(relevance, 3)
+                })
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    
     # Download Report
     st.markdown("<br>", unsafe_allow_html=True)
     if st.button("📥 Download Full Performance Report", type="primary"):
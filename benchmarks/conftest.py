@@ -0,0 +1,87 @@
+"""
+Shared fixtures for the coaching engine regression and benchmark suite.
+Golden transcripts live in transcripts/, regression thresholds in baseline.json.
+Latency is compared as a ratio to a calibration loop timed on the same machine,
+so faster or slower runners share one baseline; allocations are compared directly.
+"""
+
+import json
+import os
+import timeit
+from pathlib import Path
+
+import pytest
+
+BENCHMARK_DIR = Path(__file__).parent
+TRANSCRIPT_DIR = BENCHMARK_DIR / "transcripts"
+BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+
+TRANSCRIPTS = sorted(TRANSCRIPT_DIR.glob("*.json"))
+
+CALIBRATION_ROUNDS = 2000
+CALIBRATION_PAYLOAD = {'scores': list(range(50)), 'areas': ['Objection Handling', 'Rapport Building']}
+
+def calibration_workload():
+    # Dict, list and string work similar in kind to the engine's generators
+    return sorted(json.dumps(CALIBRATION_PAYLOAD).split(","), reverse=True)
+
+def calibration_p95_ms():
+    timings = sorted(timeit.repeat(calibration_workload, number=1, repeat=CALIBRATION_ROUNDS))
+    return timings[int(0.95 * (len(timings) - 1))] * 1000
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-baseline",
+        action="store_true",
+        help="Record measured p95 latency and peak allocations in baseline.json instead of asserting"
+    )
+
+def pytest_configure(config):
+    config.measurements = {}
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if not config.getoption("--update-baseline") or not config.measurements:
+        return
+    baseline = json.loads(BASELINE_PATH.read_text())
+    for function, measured in config.measurements.items():
+        baseline[function] = {metric: round(value, 4) for metric, value in measured.items()}
+    BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+
+@pytest.fixture(params=TRANSCRIPTS, ids=[path.stem for path in TRANSCRIPTS])
+def transcript(request):
+    return json.loads(request.param.read_text())
+
+@pytest.fixture(scope="session")
+def baseline():
+    return json.loads(BASELINE_PATH.read_text())
+
+@pytest.fixture
+def check_regression(request, baseline):
+    """Assert a measurement is within tolerance of its baseline (or record it).
+
+    p95_ms values are divided by the calibration loop's p95, timed right
+    before the check, and compared as p95_ratio.
+    """
+    config = request.config
+    override = os.environ.get("BENCH_TOLERANCE")
+    tolerances = {
+        "p95_ratio": float(override or baseline["latency_tolerance"]),
+        "peak_kib": float(override or baseline["allocation_tolerance"])
+    }
+
+    def check(function, metric, value):
+        if metric == "p95_ms":
+            metric, value = "p95_ratio", value / calibration_p95_ms()
+        tolerance = tolerances[metric]
+        if config.getoption("--update-baseline"):
+            measured = config.measurements.setdefault(function, {})
+            measured[metric] = max(measured.get(metric, 0.0), value)
+            return
+        limit = baseline[function][metric] * tolerance
+        assert value <= limit, (
+            f"{function} {metric} regressed: {value:.4f} > {limit:.4f} "
+            f"(baseline {baseline[function][metric]} x {tolerance})"
+        )
+
+    return check
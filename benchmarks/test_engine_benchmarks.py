@@ -0,0 +1,49 @@
+"""
+Latency and memory benchmarks for the coaching engine.
+Fails when p95 latency (relative to a calibration loop) or peak allocations
+exceed baseline.json x tolerance.
+Run: pytest benchmarks (re-record with --update-baseline, loosen with BENCH_TOLERANCE)
+"""
+
+import tracemalloc
+
+import pytest
+
+from coaching_engine import personas, generate_ai_response, generate_ai_assessment
+
+pytest.importorskip("pytest_benchmark")
+
+def p95_ms(benchmark):
+    timings = sorted(benchmark.stats.stats.data)
+    return timings[int(0.95 * (len(timings) - 1))] * 1000
+
+def peak_kib(func, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def test_generate_ai_response_benchmark(benchmark, transcript, check_regression):
+    message = max((m['content'] for m in transcript['messages'] if m['role'] == 'user'), key=len)
+    args = (transcript['persona'], message)
+    kwargs = {'on_model_call': lambda record: None}
+
+    benchmark(generate_ai_response, *args, **kwargs)
+    if benchmark.stats is None:
+        pytest.skip("benchmarking disabled")
+
+    check_regression("generate_ai_response", "p95_ms", p95_ms(benchmark))
+    check_regression("generate_ai_response", "peak_kib", peak_kib(generate_ai_response, *args, **kwargs))
+
+def test_generate_ai_assessment_benchmark(benchmark, transcript, check_regression):
+    args = (transcript['messages'], personas[transcript['persona']])
+    kwargs = {'persona_name': transcript['persona'], 'on_model_call': lambda record: None}
+
+    benchmark(generate_ai_assessment, *args, **kwargs)
+    if benchmark.stats is None:
+        pytest.skip("benchmarking disabled")
+
+    check_regression("generate_ai_assessment", "p95_ms", p95_ms(benchmark))
+    check_regression("generate_ai_assessment", "peak_kib", peak_kib(generate_ai_assessment, *args, **kwargs))
@@ -0,0 +1,183 @@
+"""
+Session event log tests: segment rollover, replay, session rebuild and
+exactly-once delivery to subscribers.
+Run: pytest benchmarks
+"""
+
+import threading
+import time
+
+import pytest
+
+from event_log import SessionEventLog
+
+@pytest.fixture
+def event_log(tmp_path):
+    log = SessionEventLog(str(tmp_path), segment_max_bytes=1024, batch_size=4, flush_interval=60)
+    yield log
+    log.close()
+
+def log_conversation(log, session_id, persona="Dr. Sarah Chen", turns=2):
+    log.append(session_id, "session_started", {"persona": persona})
+    for turn in range(turns):
+        log.append(session_id, "message_sent", {"content": f"rep message {turn}"})
+        log.append(session_id, "persona_reply", {"content": f"persona reply {turn}"})
+    log.append(session_id, "assessment_produced", {"overall_score": 87})
+    log.append(session_id, "session_ended", {"reason": "completed"})
+
+def test_segments_roll_over_at_max_size(event_log):
+    for idx in range(10):
+        log_conversation(event_log, f"session-{idx}")
+
+    segments = event_log.segments()
+    assert len(segments) > 1
+    assert segments == sorted(segments)
+    assert len(list(event_log.replay())) == 10 * 7
+
+def test_replay_filters_by_session_and_type(event_log):
+    log_conversation(event_log, "a")
+    log_conversation(event_log, "b", turns=3)
+
+    assert {event["session_id"] for event in event_log.replay("b")} == {"b"}
+    assert len(list(event_log.replay("b"))) == 9
+    replies = list(event_log.replay(event_types=("persona_reply",)))
+    assert [event["payload"]["content"] for event in replies] == [
+        "persona reply 0", "persona reply 1", "persona reply 0", "persona reply 1", "persona reply 2"
+    ]
+
+def test_replay_includes_buffered_events(event_log):
+    event_log.append("a", "message_sent", {"content": "not flushed yet"})
+
+    assert [event["payload"]["content"] for event in event_log.replay("a")] == ["not flushed yet"]
+
+def test_rebuild_session(event_log):
+    log_conversation(event_log, "a", persona="Dr. Emily Watson")
+    log_conversation(event_log, "b")
+
+    session = event_log.rebuild_session("a")
+
+    assert session["persona"] == "Dr. Emily Watson"
+    assert [(m["role"], m["content"]) for m in session["messages"]] == [
+        ("user", "rep message 0"), ("ai", "persona reply 0"),
+        ("user", "rep message 1"), ("ai", "persona reply 1")
+    ]
+    assert session["assessment"] == {"overall_score": 87}
+    assert session["end_reason"] == "completed"
+
+def test_log_survives_reopen(tmp_path):
+    log = SessionEventLog(str(tmp_path), segment_max_bytes=1024)
+    log_conversation(log, "a")
+    log.close()
+
+    reopened = SessionEventLog(str(tmp_path), segment_max_bytes=1024)
+    log_conversation(reopened, "b")
+    try:
+        assert [event["session_id"] for event in reopened.replay()] == ["a"] * 7 + ["b"] * 7
+    finally:
+        reopened.close()
+
+def test_failing_listener_does_not_break_append(event_log):
+    def broken(event):
+        raise RuntimeError("listener bug")
+
+    event_log.subscribe(broken)
+    event_log.append("a", "message_sent", {"content": "still logged"})
+
+    assert len(list(event_log.replay("a"))) == 1
+
+def test_replay_and_subscribe_delivers_each_event_once(event_log):
+    for idx in range(200):
+        event_log.append("before", "message_sent", {"content": str(idx)})
+
+    seen = []
+    stop = threading.Event()
+
+    def writer():
+        idx = 0
+        while not stop.is_set():
+            event_log.append("during", "message_sent", {"content": str(idx)})
+            idx += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    event_log.replay_and_subscribe(seen.append)
+    stop.set()
+    thread.join()
+
+    logged = [(event["session_id"], event["payload"]["content"]) for event in event_log.replay()]
+    delivered = [(event["session_id"], event["payload"]["content"]) for event in seen]
+    assert delivered == logged
+
+def test_torn_last_line_is_dropped_on_reopen(tmp_path):
+    log = SessionEventLog(str(tmp_path))
+    log_conversation(log, "a")
+    log.close()
+    segment = tmp_path / log.segments()[-1]
+    with open(segment, "ab") as f:
+        f.write(b'{"session_id": "a", "type": "message_se')
+
+    reopened = SessionEventLog(str(tmp_path))
+    reopened.append("b", "message_sent", {"content": "after the crash"})
+    try:
+        events = list(reopened.replay())
+        assert [event["session_id"] for event in events] == ["a"] * 7 + ["b"]
+        assert events[-1]["payload"]["content"] == "after the crash"
+    finally:
+        reopened.close()
+
+def test_replay_skips_incomplete_last_line(event_log):
+    log_conversation(event_log, "a")
+    event_log.flush()
+    with open(event_log._file.name, "ab") as f:
+        f.write(b'{"session_id": "a", "ty')
+
+    assert len(list(event_log.replay())) == 7
+
+def test_append_after_idle_does_not_flush_inline(tmp_path):
+    log = SessionEventLog(str(tmp_path), batch_size=64, flush_interval=0.05)
+    try:
+        segment = tmp_path / log.segments()[-1]
+        log.append("a", "message_sent", {"content": "first"})
+        time.sleep(0.2)  # background flusher writes the first event
+        size_after_idle = segment.stat().st_size
+
+        log.append("a", "persona_reply", {"content": "after a pause"})
+
+        assert segment.stat().st_size == size_after_idle
+        time.sleep(0.2)
+        assert segment.stat().st_size > size_after_idle
+    finally:
+        log.close()
+
+def test_replay_and_subscribe_does_not_block_appends(event_log):
+    log_conversation(event_log, "before")
+    seen = []
+
+    def slow_listener(event):
+        if not seen:
+            # An append from another session while the history is replaying must not wait for it
+            writer = threading.Thread(target=event_log.append, args=("during", "message_sent", {"content": "live"}))
+            writer.start()
+            writer.join(timeout=2)
+            assert not writer.is_alive()
+        seen.append(event)
+
+    event_log.replay_and_subscribe(slow_listener)
+
+    assert [event["session_id"] for event in seen] == ["before"] * 7 + ["during"]
+
+def test_replay_and_subscribe_in_background(event_log):
+    log_conversation(event_log, "before")
+    seen = []
+
+    caught_up = event_log.replay_and_subscribe_in_background(seen.append, event_types=("persona_reply",))
+    assert caught_up.wait(timeout=2)
+    event_log.append("after", "persona_reply", {"content": "live"})
+
+    assert [event["payload"]["content"] for event in seen] == ["persona reply 0", "persona reply 1", "live"]
+
+def test_type_filter_ignores_lookalike_payloads(event_log):
+    event_log.append("a", "message_sent", {"content": '"type": "model_call"', "type": "model_call"})
+    event_log.append("a", "model_call", {"cost": 0.01})
+
+    assert [event["type"] for event in event_log.replay(event_types=("model_call",))] == ["model_call"]
@@ -0,0 +1,58 @@
+"""
+Golden transcript regression tests: recorded conversations per persona pin the
+assessment structure and model routing of the coaching engine.
+Run: pytest benchmarks
+"""
+
+from coaching_engine import personas, generate_ai_response, generate_ai_assessment, route_model
+
+LMS_FIELDS = {'title', 'type', 'duration', 'priority', 'link', 'description'}
+
+def test_transcript_persona_exists(transcript):
+    assert transcript['persona'] in personas
+
+def test_assessment_structure(transcript):
+    expected = transcript['expected']
+    assessment = generate_ai_assessment(transcript['messages'], personas[transcript['persona']])
+
+    assert assessment['overall_score'] == expected['overall_score']
+    assert assessment['category_scores'] == expected['category_scores']
+    assert assessment['weak_areas'] == expected['weak_areas']
+    assert assessment['strong_areas'] == expected['strong_areas']
+    assert assessment['skill_level_update'] == expected['skill_level_update']
+    assert [module['title'] for module in assessment['lms_recommendations']] == expected['lms_recommendations']
+    for module in assessment['lms_recommendations']:
+        assert set(module) == LMS_FIELDS
+        assert module['priority'] in ('High', 'Medium', 'Low')
+
+def test_assessment_areas_are_scored_categories(transcript):
+    assessment = generate_ai_assessment(transcript['messages'], personas[transcript['persona']])
+    categories = set(assessment['category_scores'])
+    assert set(assessment['weak_areas']) <= categories
+    assert set(assessment['strong_areas']) <= categories
+    assert all(0 <= score <= 100 for score in assessment['category_scores'].values())
+
+def test_reply_routing(transcript):
+    persona = personas[transcript['persona']]
+    user_messages = [m['content'] for m in transcript['messages'] if m['role'] == 'user']
+    assert [route_model(persona, message) for message in user_messages] == transcript['expected']['reply_tiers']
+    assert route_model(persona) == transcript['expected']['assessment_tier']
+
+def test_model_calls_are_recorded(transcript):
+    calls = []
+    user_messages = [m['content'] for m in transcript['messages'] if m['role'] == 'user']
+    for message in user_messages:
+        reply = generate_ai_response(transcript['persona'], message, on_model_call=calls.append)
+        assert reply
+    generate_ai_assessment(transcript['messages'], personas[transcript['persona']],
+                           persona_name=transcript['persona'], on_model_call=calls.append)
+
+    assert [call['function'] for call in calls] == ['generate_ai_response'] * len(user_messages) + ['generate_ai_assessment']
+    assert [call['tier'] for call in calls] == transcript['expected']['reply_tiers'] + [transcript['expected']['assessment_tier']]
+    assert all(call['input_tokens'] > 0 and call['output_tokens'] > 0 and call['cost'] > 0 for call in calls)
+
+def test_over_budget_routes_everything_to_fast_tier(transcript):
+    calls = []
+    generate_ai_assessment(transcript['messages'], personas[transcript['persona']],
+                           over_budget=True, on_model_call=calls.append)
+    assert calls[0]['tier'] == 'fast'
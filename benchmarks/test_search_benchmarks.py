@@ -0,0 +1,69 @@
+"""
+Transcript search latency on a 1M-message index built from the persona replies
+and golden transcripts. Fails when any query's p95 exceeds SEARCH_P95_LIMIT_MS
+(scaled by BENCH_TOLERANCE).
+Run: pytest benchmarks
+"""
+
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from coaching_engine import personas, generate_ai_response
+from transcript_search import TranscriptSearchIndex
+
+TRANSCRIPTS = sorted((Path(__file__).parent / "transcripts").glob("*.json"))
+INDEX_MESSAGES = 1_000_000
+MESSAGES_PER_SESSION = 10
+SEARCH_P95_LIMIT_MS = 200
+SEARCH_ROUNDS = 20
+QUERIES = ["cost concerns", "hospital formulary process", "patients", "clinical trial data",
+           "what about the cost for my patients"]
+
+@pytest.fixture(scope="module")
+def large_index():
+    rng = random.Random(0)
+    random.seed(0)
+    replies = sorted({generate_ai_response(name, "") for name in personas for _ in range(50)})
+    lines = sorted({m['content'] for path in TRANSCRIPTS for m in json.loads(path.read_text())['messages']})
+    names = list(personas)
+    index = TranscriptSearchIndex(similar_wording=False)
+    for session in range(INDEX_MESSAGES // MESSAGES_PER_SESSION):
+        session_id = f"session-{session}"
+        ts = (date(2026, 1, 1) + timedelta(days=session % 180)).isoformat() + "T09:00:00"
+        index.add_event({"session_id": session_id, "type": "session_started", "ts": ts,
+                         "payload": {"persona": names[session % len(names)]}})
+        for turn in range(MESSAGES_PER_SESSION // 2):
+            index.add_event({"session_id": session_id, "type": "message_sent", "ts": ts,
+                             "payload": {"content": rng.choice(lines)}})
+            index.add_event({"session_id": session_id, "type": "persona_reply", "ts": ts,
+                             "payload": {"content": rng.choice(replies)}})
+        index.add_event({"session_id": session_id, "type": "assessment_produced", "ts": ts,
+                         "payload": {"overall_score": 50 + session % 50}})
+    return index
+
+def p95_ms(func):
+    timings = []
+    for _ in range(SEARCH_ROUNDS):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[int(0.95 * (len(timings) - 1))]
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_latency_on_1m_messages(large_index, query):
+    assert len(large_index.messages) == INDEX_MESSAGES
+    assert large_index.search(query), f"no hits for {query!r}"
+
+    limit = SEARCH_P95_LIMIT_MS * float(os.environ.get("BENCH_TOLERANCE", 1))
+    measured = p95_ms(lambda: large_index.search(query))
+    filtered = p95_ms(lambda: large_index.search(query, personas=["Dr. Emily Watson"], role="ai", min_score=90))
+
+    assert measured <= limit, f"{query!r} p95 {measured:.1f} ms > {limit:.0f} ms"
+    assert filtered <= limit, f"{query!r} (filtered) p95 {filtered:.1f} ms > {limit:.0f} ms"
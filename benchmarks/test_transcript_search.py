@@ -0,0 +1,119 @@
+"""
+Transcript search tests: keyword and similar-wording queries, session filters
+and incremental updates from the event log.
+Run: pytest benchmarks
+"""
+
+from datetime import date
+
+import pytest
+
+import transcript_search
+from event_log import SessionEventLog
+from transcript_search import TranscriptSearchIndex, stem
+
+def event(session_id, event_type, payload, ts="2026-03-02T10:00:00"):
+    return {"session_id": session_id, "type": event_type, "payload": payload, "ts": ts}
+
+def add_session(index, session_id, persona, messages, score=None, ts="2026-03-02T10:00:00"):
+    index.add_event(event(session_id, "session_started", {"persona": persona}, ts))
+    for role, content in messages:
+        event_type = "message_sent" if role == "user" else "persona_reply"
+        index.add_event(event(session_id, event_type, {"content": content}, ts))
+    if score is not None:
+        index.add_event(event(session_id, "assessment_produced", {"overall_score": score}, ts))
+
+def contents(index, results):
+    return [index.messages[message_id][2] for _, message_id in results]
+
+@pytest.fixture
+def index():
+    index = TranscriptSearchIndex()
+    add_session(index, "chen", "Dr. Sarah Chen", [
+        ("user", "Our drug lowers cardiovascular events by 20%."),
+        ("ai", "What is the cost compared to the generic? Cost is a real issue for my patients."),
+    ], score=82, ts="2026-03-02T10:00:00")
+    add_session(index, "watson", "Dr. Emily Watson", [
+        ("user", "Can we start the formulary review this quarter?"),
+        ("ai", "Anything new has to go through our hospital formulary process first."),
+    ], score=64, ts="2026-04-15T09:30:00")
+    return index
+
+def test_keyword_search_ranks_by_term_frequency(index):
+    results = index.search("cost")
+
+    assert contents(index, results) == [
+        "What is the cost compared to the generic? Cost is a real issue for my patients."
+    ]
+
+def test_keyword_search_ranks_full_matches_before_partial_ones(index):
+    results = index.search("hospital formulary process")
+
+    assert [score for score, _ in results] == sorted((score for score, _ in results), reverse=True)
+    assert contents(index, results) == [
+        "Anything new has to go through our hospital formulary process first.",
+        "Can we start the formulary review this quarter?",
+    ]
+    assert len(index.search("cost formulary")) == 3
+
+def test_keyword_search_matches_word_forms(index):
+    add_session(index, "roberts", "Dr. Michael Roberts", [("ai", "I'm concerned about the costs.")])
+
+    assert contents(index, index.search("cost concerns"))[0] == "I'm concerned about the costs."
+
+@pytest.mark.parametrize("words, expected", [
+    (("concerns", "concerned", "concerning"), "concern"),
+    (("patients", "patient's"), "patient"),
+    (("processes", "process"), "process"),
+    (("studies", "studied", "study"), "study"),
+    (("incorporated", "incorporate"), "incorporate"),
+    (("stopped", "stop"), "stop"),
+])
+def test_stem_conflates_word_forms(words, expected):
+    assert {stem(word) for word in words} == {expected}
+
+def test_common_terms_only_rerank(index, monkeypatch):
+    monkeypatch.setattr(transcript_search, "COMMON_TERM_POSTINGS", 1)
+    add_session(index, "roberts", "Dr. Michael Roberts", [("ai", "Cost matters to my patients.")])
+
+    assert contents(index, index.search("patients generic")) == [
+        "What is the cost compared to the generic? Cost is a real issue for my patients.",
+    ]
+    assert contents(index, index.search("cost patients")) == [
+        "What is the cost compared to the generic? Cost is a real issue for my patients.",
+        "Cost matters to my patients.",
+    ]
+
+def test_search_filters_by_session_and_role(index):
+    assert len(index.search("formulary")) == 2
+    assert len(index.search("formulary", personas=["Dr. Sarah Chen"])) == 0
+    assert len(index.search("formulary", role="user")) == 1
+    assert len(index.search("formulary", min_score=70)) == 0
+    assert len(index.search("formulary", start_date=date(2026, 4, 1))) == 2
+    assert len(index.search("formulary", end_date=date(2026, 3, 31))) == 0
+
+def test_search_ignores_empty_queries(index):
+    assert index.search("") == []
+    assert index.search("?!") == []
+
+def test_similar_wording_falls_back_to_keyword_without_numpy(monkeypatch):
+    monkeypatch.setattr(transcript_search, "np", None)
+    index = TranscriptSearchIndex()
+    add_session(index, "a", "Dr. Sarah Chen", [("ai", "Cost is my main concern.")])
+
+    assert not index.similar_wording
+    assert len(index.search("cost", mode="similar wording")) == 1
+
+def test_index_follows_the_event_log(tmp_path):
+    log = SessionEventLog(str(tmp_path))
+    try:
+        log.append("a", "session_started", {"persona": "Dr. Michael Roberts"})
+        log.append("a", "message_sent", {"content": "Insurance coverage is broad."})
+        index = TranscriptSearchIndex()
+        log.replay_and_subscribe(index.add_event)
+        log.append("a", "persona_reply", {"content": "Which insurance plans exactly?"})
+
+        assert len(index.search("insurance")) == 2
+        assert index.sessions["a"]["persona"] == "Dr. Michael Roberts"
+    finally:
+        log.close()
@@ -0,0 +1,86 @@
+"""
+Usage ledger tests: model call records and per-tenant monthly spend, including
+rebuilding the ledger from the event log.
+Run: pytest benchmarks
+"""
+
+from datetime import datetime
+
+from event_log import SessionEventLog
+from usage_ledger import LEDGER_COLUMNS, UsageLedger
+
+def model_call(session_id, tenant, cost, ts, rep="Alex Morgan"):
+    return {"session_id": session_id, "type": "model_call", "ts": ts, "payload": {
+        "rep": rep, "team": "Cardio East", "tenant": tenant, "persona": "Dr. Sarah Chen",
+        "function": "generate_ai_response", "tier": "fast", "model": "gpt-4o-mini",
+        "input_tokens": 120, "output_tokens": 40, "cost": cost, "latency_ms": 0.2, "turn_latency_ms": 1500.0
+    }}
+
+def test_tenant_spend_is_per_tenant_and_month():
+    ledger = UsageLedger()
+    ledger.add_event(model_call("a", "demo-pharma", 0.25, "2026-03-02T10:00:00"))
+    ledger.add_event(model_call("a", "demo-pharma", 0.50, "2026-03-31T23:59:00"))
+    ledger.add_event(model_call("b", "demo-pharma", 1.00, "2026-04-01T08:00:00"))
+    ledger.add_event(model_call("c", "other-pharma", 2.00, "2026-03-15T12:00:00"))
+
+    assert ledger.tenant_spend("demo-pharma", "2026-03") == 0.75
+    assert ledger.tenant_spend("demo-pharma", "2026-04") == 1.00
+    assert ledger.tenant_spend("other-pharma", "2026-03") == 2.00
+    assert ledger.tenant_spend("unknown", "2026-03") == 0.0
+
+def test_tenant_spend_defaults_to_current_month():
+    ledger = UsageLedger()
+    now = datetime.now().isoformat()
+    ledger.add_event(model_call("a", "demo-pharma", 0.25, now))
+    ledger.add_event(model_call("a", "demo-pharma", 9.00, "2000-01-01T00:00:00"))
+
+    assert ledger.tenant_spend("demo-pharma") == 0.25
+
+def test_ledger_ignores_other_events():
+    ledger = UsageLedger()
+    ledger.add_event({"session_id": "a", "type": "message_sent", "ts": "2026-03-02T10:00:00",
+                      "payload": {"content": "hello"}})
+
+    assert ledger.snapshot() == []
+
+def test_snapshot_has_ledger_columns():
+    ledger = UsageLedger()
+    ledger.add_event(model_call("a", "demo-pharma", 0.25, "2026-03-02T10:00:00"))
+
+    (record,) = ledger.snapshot()
+    assert set(record) == set(LEDGER_COLUMNS)
+    assert record["session_id"] == "a"
+
+def test_ledger_rebuilds_from_event_log(tmp_path):
+    log = SessionEventLog(str(tmp_path))
+    try:
+        for event in (model_call("a", "demo-pharma", 0.25, ""), model_call("b", "demo-pharma", 0.50, "")):
+            log.append(event["session_id"], "model_call", event["payload"])
+        log.append("b", "message_sent", {"content": "not a model call"})
+        ledger = UsageLedger()
+        log.replay_and_subscribe(ledger.add_event, event_types=("model_call",))
+        log.append("c", "model_call", model_call("c", "demo-pharma", 1.00, "")["payload"])
+
+        assert [record["session_id"] for record in ledger.snapshot()] == ["a", "b", "c"]
+        assert ledger.tenant_spend("demo-pharma") == 1.75
+    finally:
+        log.close()
+
+def test_budget_status_soft_then_hard_limit():
+    ledger = UsageLedger(budgets={"demo-pharma": 10.00}, soft_limit_fraction=0.8)
+    month = "2026-03"
+
+    assert ledger.budget_status("demo-pharma", month) == "ok"
+    ledger.add_event(model_call("a", "demo-pharma", 7.99, "2026-03-02T10:00:00"))
+    assert ledger.budget_status("demo-pharma", month) == "ok"
+    ledger.add_event(model_call("a", "demo-pharma", 0.01, "2026-03-02T10:01:00"))
+    assert ledger.budget_status("demo-pharma", month) == "soft"
+    ledger.add_event(model_call("a", "demo-pharma", 2.00, "2026-03-02T10:02:00"))
+    assert ledger.budget_status("demo-pharma", month) == "blocked"
+    assert ledger.budget_status("demo-pharma", "2026-04") == "ok"
+
+def test_tenants_without_a_budget_are_never_limited():
+    ledger = UsageLedger(budgets={})
+    ledger.add_event(model_call("a", "demo-pharma", 1000.00, "2026-03-02T10:00:00"))
+
+    assert ledger.budget_status("demo-pharma", "2026-03") == "ok"
@@ -0,0 +1,121 @@
+"""
+Voice pipeline tests driven by recorded audio fixtures in audio/ (a tone and a
+short spoken command with its expected transcript).
+Speech recognition runs only when vosk and a model (VOSK_MODEL_PATH) are installed.
+Run: pytest benchmarks
+"""
+
+import io
+import wave
+from pathlib import Path
+
+import pytest
+
+import voice_pipeline
+from voice_pipeline import (PartialStabilizer, iter_wav_chunks, load_speech_model, synthesize_stream,
+                            transcribe_stream, wav_duration)
+
+AUDIO_DIR = Path(__file__).parent / "audio"
+TONE_FIXTURE = AUDIO_DIR / "tone_600ms_16k.wav"
+UTTERANCE_FIXTURE = AUDIO_DIR / "go_forward_ten_meters_16k.wav"
+UTTERANCE_TRANSCRIPT = "go forward ten meters"
+
+def make_wav(seconds, channels=1, rate=16000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\0\0" * channels * int(rate * seconds))
+    return buffer.getvalue()
+
+class RecordingEngine:
+    """pyttsx3-compatible engine that writes a short WAV per queued sentence."""
+
+    def __init__(self):
+        self.sentences = []
+        self._queued = []
+
+    def save_to_file(self, text, path):
+        self._queued.append((text, path))
+
+    def runAndWait(self):
+        for text, path in self._queued:
+            self.sentences.append(text)
+            with open(path, "wb") as f:
+                f.write(make_wav(0.1 * len(text.split())))
+        self._queued = []
+
+def test_iter_wav_chunks_splits_fixture():
+    audio = TONE_FIXTURE.read_bytes()
+    chunks = list(iter_wav_chunks(audio, chunk_ms=200))
+
+    assert [rate for rate, _ in chunks] == [16000] * 3
+    assert [len(chunk) for _, chunk in chunks] == [16000 * 2 // 5] * 3
+    assert wav_duration(audio) == pytest.approx(0.6)
+
+def test_iter_wav_chunks_rejects_stereo():
+    with pytest.raises(ValueError):
+        list(iter_wav_chunks(make_wav(0.2, channels=2)))
+
+def test_partial_stabilizer_emits_words_once_unchanged():
+    stabilizer = PartialStabilizer(runs=2)
+    hypotheses = [["cost"], ["cost", "con"], ["cost", "concerns"], ["cost", "concerns"], ["cost", "concerns", "are"]]
+
+    updates = [stabilizer.text for words in hypotheses if stabilizer.partial(words)]
+
+    assert updates == ["cost", "cost concerns"]
+
+def test_partial_stabilizer_keeps_final_words_and_resets_partials():
+    stabilizer = PartialStabilizer(runs=2)
+    stabilizer.partial(["what"])
+    stabilizer.partial(["what", "about"])
+    stabilizer.final(["what", "about", "cost"])
+
+    assert stabilizer.text == "what about cost"
+    assert not stabilizer.partial(["the"])
+    assert stabilizer.partial(["the", "formulary"])
+    assert stabilizer.text == "what about cost the"
+
+def test_transcribe_stream_fixture():
+    model = load_speech_model()
+    if model is None:
+        pytest.skip("vosk or the speech model is not installed")
+
+    results = list(transcribe_stream(TONE_FIXTURE.read_bytes(), model))
+
+    assert [is_final for _, is_final in results] == [False] * (len(results) - 1) + [True]
+    texts = [text for text, _ in results]
+    assert all(later.startswith(earlier) for earlier, later in zip(texts, texts[1:]))
+
+def test_transcribe_stream_recorded_utterance():
+    model = load_speech_model()
+    if model is None:
+        pytest.skip("vosk or the speech model is not installed")
+
+    results = list(transcribe_stream(UTTERANCE_FIXTURE.read_bytes(), model))
+
+    assert results[-1] == (UTTERANCE_TRANSCRIPT, True)
+    assert all(UTTERANCE_TRANSCRIPT.startswith(text) for text, _ in results)
+
+def test_synthesize_stream_yields_one_clip_per_sentence():
+    engine = RecordingEngine()
+    reply = "That's interesting. How does this compare to the current standard of care?"
+
+    clips = synthesize_stream(reply, engine)
+    first = next(clips)
+
+    assert engine.sentences == ["That's interesting."]
+    assert wav_duration(first) == pytest.approx(0.2)
+    assert len(list(clips)) == 1
+    assert engine.sentences[-1] == "How does this compare to the current standard of care?"
+
+def test_synthesize_stream_releases_engine_between_sentences():
+    clips = synthesize_stream("First reply. Second reply.", RecordingEngine())
+    next(clips)
+
+    other = RecordingEngine()
+    assert voice_pipeline._synthesizer_lock.acquire(timeout=1)
+    voice_pipeline._synthesizer_lock.release()
+    assert len(list(synthesize_stream("Another session.", other))) == 1
+    assert len(list(clips)) == 1
@@ -0,0 +1,201 @@
+"""
+AI Healthcare Coaching Platform - Coaching Engine
+HCP personas, model routing and the response/assessment generators.
+Kept free of Streamlit so it can be imported by app.py and the benchmarks.
+"""
+
+import re
+import math
+import json
+import time
+import random
+
+# HCP Personas Data
+personas = {
+    "Dr. Sarah Chen": {
+        "specialty": "Cardiologist",
+        "experience": "15 years",
+        "personality": "Data-driven, skeptical of new treatments",
+        "context": "Busy practice, values efficiency",
+        "difficulty": "Hard",
+        "objections": ["Need more clinical data", "Current treatment works fine", "Cost concerns"],
+        "avatar": "👩‍⚕️"
+    },
+    "Dr. Michael Roberts": {
+        "specialty": "General Practitioner",
+        "experience": "8 years",
+        "personality": "Open to innovation, patient-focused",
+        "context": "Growing practice, interested in new solutions",
+        "difficulty": "Medium",
+        "objections": ["Patient acceptance", "Insurance coverage", "Training requirements"],
+        "avatar": "👨‍⚕️"
+    },
+    "Dr. Emily Watson": {
+        "specialty": "Oncologist",
+        "experience": "20 years",
+        "personality": "Conservative, evidence-based",
+        "context": "Academic hospital setting",
+        "difficulty": "Hard",
+        "objections": ["Peer-reviewed studies needed", "Hospital formulary process", "Side effect profile"],
+        "avatar": "👩‍⚕️"
+    }
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+# Model Routing - cheap tier for easy turns, strong tier for hard ones
+MODEL_TIERS = {
+    "fast": {"model": "gpt-4o-mini", "input_per_1k": 0.00015, "output_per_1k": 0.0006},
+    "strong": {"model": "gpt-4o", "input_per_1k": 0.0025, "output_per_1k": 0.01}
+}
+EASY_DIFFICULTIES = ("Easy", "Medium")
+SHORT_UTTERANCE_WORDS = 12
+
+def estimate_tokens(text):
+    """Approximate token count (~4 characters per token)."""
+    return max(1, math.ceil(len(text) / 4))
+
+def route_model(persona, user_message=None, over_budget=False):
+    """Send easy turns to the fast tier and hard ones to the strong tier.
+
+    Assessments (no user_message) always use the strong tier unless the
+    tenant is past its soft budget limit, in which case everything is fast.
+    """
+    if over_budget:
+        return "fast"
+    if user_message is None:
+        return "strong"
+    if persona['difficulty'] in EASY_DIFFICULTIES or len(tokenize(user_message)) <= SHORT_UTTERANCE_WORDS:
+        return "fast"
+    return "strong"
+
+def model_call_record(function, tier, persona_name, prompt, completion, started):
+    """Token, cost and latency accounting for one (simulated) model call."""
+    tokens_in, tokens_out = estimate_tokens(prompt), estimate_tokens(completion)
+    pricing = MODEL_TIERS[tier]
+    return {
+        'persona': persona_name,
+        'function': function,
+        'tier': tier,
+        'model': pricing['model'],
+        'input_tokens': tokens_in,
+        'output_tokens': tokens_out,
+        'cost': tokens_in / 1000 * pricing['input_per_1k'] + tokens_out / 1000 * pricing['output_per_1k'],
+        'latency_ms': (time.perf_counter() - started) * 1000
+    }
+
+# AI Response Generator
+def generate_ai_response(persona_name, user_message, over_budget=False, on_model_call=None):
+    """Simulate AI responses based on persona"""
+    started = time.perf_counter()
+    persona = personas[persona_name]
+    tier = route_model(persona, user_message, over_budget)
+    responses = [
+        "I appreciate the information, but I'd need to see more robust clinical trial data before considering this for my patients. What Phase III results do you have?",
+        "That's interesting. How does this compare to the current standard of care in terms of efficacy and safety profile?",
+        "I'm concerned about the cost. Many of my patients struggle with medication affordability. What patient assistance programs are available?",
+        "Can you walk me through the mechanism of action? I want to understand how this differs from existing treatments.",
+        "What's the evidence on long-term outcomes? I'm particularly interested in real-world data beyond the clinical trials.",
+        "I've had good results with the current treatment protocol. What would be the compelling reason for me to switch?",
+        "How does this fit into the current treatment guidelines? Has it been incorporated into any professional society recommendations?",
+        "What kind of monitoring is required? I need to understand the practical implications for my practice."
+    ]
+    response = random.choice(responses)
+    prompt = f"{persona_name}: {persona['personality']}. {persona['context']}.\n{user_message}"
+    if on_model_call:
+        on_model_call(model_call_record("generate_ai_response", tier, persona_name, prompt, response, started))
+    return response
+
+# AI Assessment Generator - Generic Assessment
+def generate_ai_assessment(messages, persona, persona_name=None, over_budget=False, on_model_call=None):
+    """Generate a generic comprehensive AI assessment"""
+    started = time.perf_counter()
+    tier = route_model(persona, over_budget=over_budget)
+    
+    # Fixed assessment scores for demo
+    base_scores = {
+        'Clinical Knowledge': 87,
+        'Rapport Building': 92,
+        'Objection Handling': 78,
+        'Value Communication': 85,
+        'Compliance & Ethics': 95
+    }
+    
+    overall_score = 87
+    weak_areas = ['Objection Handling']
+    strong_areas = ['Rapport Building', 'Compliance & Ethics']
+    
+    # Generic insights
+    insights = [
+        "🎯 **Objection Handling:** Practice preemptively addressing common objections before they're raised. Use the LAER model (Listen, Acknowledge, Explore, Respond).",
+        "💪 **Strong Rapport Building:** Excellent ability to establish trust and credibility quickly with healthcare professionals.",
+        "✅ **Compliance Excellence:** Outstanding adherence to regulatory and ethical guidelines throughout the conversation."
+    ]
+    
+    # LMS recommendations for weak areas
+    lms_recommendations = [
+        {
+            'title': 'LAER Objection Handling Framework',
+            'type': 'Interactive Module',
+            'duration': '60 min',
+            'priority': 'High',
+            'link': 'https://lms.example.com/laer-framework',
+            'description': 'Master the Listen-Acknowledge-Explore-Respond methodology with practice scenarios'
+        },
+        {
+            'title': 'Top 20 HCP Objections & Responses',
+            'type': 'Reference Guide',
+            'duration': '15 min',
+            'priority': 'High',
+            'link': 'https://lms.example.com/objection-library',
+            'description': 'Comprehensive library of proven responses to common objections'
+        },
+        {
+            'title': 'Advanced Objection Handling Role-Plays',
+            'type': 'Video Series',
+            'duration': '45 min',
+            'priority': 'Medium',
+            'link': 'https://lms.example.com/objection-videos',
+            'description': 'Watch expert sales reps handle difficult objections in real-world scenarios'
+        }
+    ]
+    
+    # Scenario recommendations
+    scenario_recommendations = [
+        {
+            'title': 'Deep Objection Handling Practice',
+            'difficulty': 'Intermediate-Advanced',
+            'description': 'Face 5+ consecutive objections from a highly skeptical HCP',
+            'personas': ['Dr. Sarah Chen', 'Dr. Emily Watson'],
+            'estimated_time': '15-20 min',
+            'skills_developed': ['Persistence', 'Objection reframing', 'Emotional resilience']
+        },
+        {
+            'title': 'Multi-Stakeholder Account Meeting',
+            'difficulty': 'Advanced',
+            'description': 'Navigate complex group dynamics with department heads, formulary committee members, and budget holders',
+            'personas': ['Chief of Cardiology', 'Pharmacy Director', 'CFO'],
+            'estimated_time': '25-30 min',
+            'skills_developed': ['Stakeholder management', 'Budget negotiation', 'Group influence']
+        }
+    ]
+    
+    assessment = {
+        'overall_score': overall_score,
+        'category_scores': base_scores,
+        'weak_areas': weak_areas,
+        'strong_areas': strong_areas,
+        'insights': insights,
+        'lms_recommendations': lms_recommendations,
+        'scenario_recommendations': scenario_recommendations,
+        'skill_level_update': 'intermediate'
+    }
+    
+    prompt = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    if on_model_call:
+        on_model_call(model_call_record("generate_ai_assessment", tier, persona_name,
+                                        prompt, json.dumps(assessment), started))
+    return assessment
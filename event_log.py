@@ -0,0 +1,231 @@
+"""
+AI Healthcare Coaching Platform - Session Event Log
+Append-only, segmented JSON-lines audit trail of every practice session, with replay.
+Kept free of Streamlit so it can be tested and reused by analytics jobs.
+"""
+
+import os
+import json
+import mmap
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOG_DIR = os.environ.get("COACHING_EVENT_LOG_DIR", "session_logs")
+SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+FSYNC_BATCH_SIZE = 64
+FSYNC_INTERVAL_SECONDS = 1.0
+
+class SessionEventLog:
+    """Append-only, segmented JSON-lines log of session events.
+
+    Writes are buffered and fsynced in batches so the chat path never waits on
+    the disk; a background thread flushes anything left in the buffer every
+    flush_interval seconds and again at shutdown. Readers memory-map segments
+    for replay.
+    """
+
+    def __init__(self, log_dir=EVENT_LOG_DIR, segment_max_bytes=SEGMENT_MAX_BYTES,
+                 batch_size=FSYNC_BATCH_SIZE, flush_interval=FSYNC_INTERVAL_SECONDS):
+        self.log_dir = log_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._buffer = []
+        self._listeners = []
+        os.makedirs(self.log_dir, exist_ok=True)
+        segments = self.segments()
+        self._segment_index = int(segments[-1][8:16]) if segments else 0
+        self._file = self._open_segment()
+        self._closed = threading.Event()
+        threading.Thread(target=self._flush_periodically, name="event-log-flusher", daemon=True).start()
+        atexit.register(self.close)
+
+    def segments(self):
+        return sorted(name for name in os.listdir(self.log_dir)
+                      if name.startswith("segment-") and name.endswith(".jsonl"))
+
+    def _open_segment(self):
+        path = os.path.join(self.log_dir, f"segment-{self._segment_index:08d}.jsonl")
+        self._truncate_torn_line(path)
+        return open(path, "ab")
+
+    @staticmethod
+    def _truncate_torn_line(path):
+        """Cut a segment back to its last complete line after a crash mid-flush."""
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+        with open(path, "r+b") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[-1:] == b"\n":
+                    return
+                size, keep = len(mm), mm.rfind(b"\n") + 1
+            logger.warning("Dropping %d bytes of a torn event at the end of %s", size - keep, path)
+            f.truncate(keep)
+
+    def subscribe(self, listener):
+        """Call listener(event) for every event appended from now on."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def replay_and_subscribe(self, listener, event_types=None):
+        """Feed every logged event to listener, then subscribe it.
+
+        The bulk of the log is replayed without the lock, up to the end
+        position recorded when replay starts; only events appended since then
+        are replayed under the lock, so each event reaches the listener
+        exactly once, either from the replay or live.
+        """
+        with self._lock:
+            self._flush_locked()
+            end = self._position()
+        for event in self._read(end=end, event_types=event_types):
+            listener(event)
+        with self._lock:
+            self._flush_locked()
+            for event in self._read(start=end, event_types=event_types):
+                listener(event)
+            self._listeners.append(listener)
+
+    def replay_and_subscribe_in_background(self, listener, event_types=None):
+        """Run replay_and_subscribe on a daemon thread.
+
+        Returns a threading.Event that is set once the listener has caught up.
+        """
+        caught_up = threading.Event()
+
+        def run():
+            try:
+                self.replay_and_subscribe(listener, event_types)
+            except Exception:
+                logger.exception("Background replay of the event log into %r failed", listener)
+            finally:
+                caught_up.set()
+
+        threading.Thread(target=run, name="event-log-replay", daemon=True).start()
+        return caught_up
+
+    def append(self, session_id, event_type, payload=None):
+        """Queue an event; it is durable after the next batched or timed flush.
+
+        Only a full batch or a session_ended event is written inline; time-based
+        flushing is left to the background thread.
+        """
+        event = {
+            "session_id": session_id,
+            "type": event_type,
+            "ts": datetime.now().isoformat(),
+            "payload": payload or {}
+        }
+        line = (json.dumps(event, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size or event_type == "session_ended":
+                self._flush_locked()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                # A failing subscriber must not break the chat path; the event is already logged
+                logger.exception("Event log listener %r failed on %s event", listener, event_type)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush buffered events and stop the background flusher."""
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+            self._flush_locked()
+            self._file.close()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                with self._lock:
+                    if self._buffer and not self._closed.is_set():
+                        self._flush_locked()
+            except OSError:
+                logger.exception("Background flush of the event log failed")
+
+    def _flush_locked(self):
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer = []
+        if self._file.tell() >= self.segment_max_bytes:
+            self._file.close()
+            self._segment_index += 1
+            self._file = self._open_segment()
+
+    def _position(self):
+        """(segment index, byte offset) of the end of the flushed log."""
+        return self._segment_index, self._file.tell()
+
+    def replay(self, session_id=None, event_types=None):
+        """Yield logged events in order, optionally filtered by session and type."""
+        self.flush()
+        return self._read(session_id=session_id, event_types=event_types)
+
+    def _read(self, start=(0, 0), end=None, session_id=None, event_types=None):
+        """Yield flushed events from the start position up to the end position (or the end of the log)."""
+        session_marker = session_id.encode("utf-8") if session_id is not None else None
+        # json.dumps escapes quotes inside strings, so these only match the event's own fields
+        type_markers = (tuple(f'"type": {json.dumps(event_type)}'.encode("utf-8") for event_type in event_types)
+                        if event_types is not None else None)
+        for name in self.segments():
+            index = int(name[8:16])
+            if index < start[0] or (end is not None and index > end[0]):
+                continue
+            path = os.path.join(self.log_dir, name)
+            if os.path.getsize(path) == 0:
+                continue
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if index == start[0]:
+                    mm.seek(start[1])
+                stop = end[1] if end is not None and index == end[0] else len(mm)
+                while mm.tell() < stop:
+                    raw = mm.readline()
+                    if not raw.endswith(b"\n"):
+                        # Torn or still-being-written last line; it is not a complete event
+                        break
+                    if session_marker is not None and session_marker not in raw:
+                        continue
+                    if type_markers is not None and not any(marker in raw for marker in type_markers):
+                        continue
+                    event = json.loads(raw)
+                    if session_id is not None and event["session_id"] != session_id:
+                        continue
+                    if event_types is not None and event["type"] not in event_types:
+                        continue
+                    yield event
+
+    def rebuild_session(self, session_id):
+        """Reconstruct a session's transcript and assessment from the log."""
+        session = {"session_id": session_id, "persona": None, "messages": [],
+                   "assessment": None, "ended_at": None, "end_reason": None}
+        for event in self.replay(session_id):
+            payload = event["payload"]
+            if event["type"] == "session_started":
+                session["persona"] = payload.get("persona")
+            elif event["type"] in ("message_sent", "persona_reply"):
+                session["messages"].append({
+                    "role": "user" if event["type"] == "message_sent" else "ai",
+                    "content": payload.get("content", ""),
+                    "time": datetime.fromisoformat(event["ts"])
+                })
+            elif event["type"] == "assessment_produced":
+                session["assessment"] = payload
+            elif event["type"] == "session_ended":
+                session["ended_at"] = event["ts"]
+                session["end_reason"] = payload.get("reason")
+        return session
@@ -0,0 +1,212 @@
+"""
+AI Healthcare Coaching Platform - Transcript Search
+Keyword and similar-wording search over logged transcript messages.
+Kept free of Streamlit so it can be tested and benchmarked directly.
+"""
+
+import math
+import heapq
+import zlib
+import threading
+from functools import lru_cache
+from itertools import islice
+from collections import defaultdict
+
+from coaching_engine import tokenize
+
+try:
+    import numpy as np
+except ImportError:  # similar-wording search is optional
+    np = None
+
+HASHED_VECTOR_DIM = 256
+LSH_PLANES = 12
+COMMON_TERM_POSTINGS = 20_000  # terms in more messages than this only re-rank
+COMMON_TERM_CANDIDATES = 1_000  # most recent matches scored per term when every term is common
+STOPWORD_FRACTION = 0.5  # terms in more of the messages are dropped if the query has others
+
+@lru_cache(maxsize=65536)
+def stem(term):
+    """Light suffix stripping so concerns/concerned/concerning all match concern."""
+    if term.endswith("'s"):
+        term = term[:-2]
+    if term.endswith(("sses", "ies")):
+        term = term[:-2] if term.endswith("sses") else term[:-3] + "y"
+    elif term.endswith("s") and not term.endswith(("ss", "us", "is")) and len(term) > 3:
+        term = term[:-1]
+    for suffix in ("ing", "ied", "ed"):
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3:
+            term = term[:-len(suffix)] + ("y" if suffix == "ied" else "")
+            if term.endswith(("at", "bl", "iz")):  # incorporated -> incorporate
+                term += "e"
+            elif term[-1] == term[-2] and term[-1] not in "lsz":  # stopped -> stop
+                term = term[:-1]
+            break
+    return term
+
+def search_terms(text):
+    return [stem(term) for term in tokenize(text)]
+
+class TranscriptSearchIndex:
+    """Incrementally updated search over logged transcript messages.
+
+    Keyword search uses an inverted index (stemmed term -> message ids) and
+    ranks messages by how many query terms they contain, then by tf-idf, so
+    partial matches still come back. When NumPy is
+    available, messages are also hashed into bag-of-words vectors and bucketed
+    by random-hyperplane LSH, so messages with overlapping wording can be found
+    without every query term matching. This is not semantic search.
+    """
+
+    def __init__(self, similar_wording=True):
+        self._lock = threading.Lock()
+        self.messages = []  # (session_id, role, content, ts)
+        self.postings = defaultdict(dict)  # term -> {message_id: term frequency}
+        self.sessions = {}  # session_id -> {'persona', 'date', 'score'}
+        self.session_messages = defaultdict(list)  # session_id -> message ids
+        self.similar_wording = similar_wording and np is not None
+        if self.similar_wording:
+            rng = np.random.default_rng(0)
+            self._planes = rng.standard_normal((LSH_PLANES, HASHED_VECTOR_DIM)).astype(np.float32)
+            self._vectors = np.zeros((1024, HASHED_VECTOR_DIM), dtype=np.float32)
+            self._buckets = defaultdict(list)
+
+    def add_event(self, event):
+        with self._lock:
+            session = self.sessions.setdefault(
+                event["session_id"], {"persona": None, "date": event["ts"][:10], "score": None})
+            payload = event["payload"]
+            if event["type"] == "session_started":
+                session["persona"] = payload.get("persona")
+            elif event["type"] == "assessment_produced":
+                session["score"] = payload.get("overall_score")
+            elif event["type"] in ("message_sent", "persona_reply"):
+                self._add_message(event["session_id"],
+                                  "user" if event["type"] == "message_sent" else "ai",
+                                  payload.get("content", ""), event["ts"])
+
+    def _add_message(self, session_id, role, content, ts):
+        message_id = len(self.messages)
+        self.messages.append((session_id, role, content, ts))
+        self.session_messages[session_id].append(message_id)
+        terms = search_terms(content)
+        for term in terms:
+            self.postings[term][message_id] = self.postings[term].get(message_id, 0) + 1
+        if self.similar_wording:
+            if message_id >= len(self._vectors):
+                self._vectors = np.concatenate([self._vectors, np.zeros_like(self._vectors)])
+            vector = self._hash_vector(terms)
+            self._vectors[message_id] = vector
+            self._buckets[self._bucket(vector)].append(message_id)
+
+    def _hash_vector(self, terms):
+        vector = np.zeros(HASHED_VECTOR_DIM, dtype=np.float32)
+        for term in terms:
+            # crc32 is stable across processes, unlike hash()
+            h = zlib.crc32(term.encode("utf-8"))
+            vector[h % HASHED_VECTOR_DIM] += 1.0 if (h >> 16) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _bucket(self, vector):
+        bits = (self._planes @ vector) > 0
+        return int(bits.dot(1 << np.arange(LSH_PLANES)))
+
+    def _allowed_sessions(self, personas, start_date, end_date, min_score):
+        """Resolve session-level filters once per query, or None if unfiltered.
+
+        Matching session ids come back newest session first.
+        """
+        if not (personas or start_date or end_date or min_score is not None):
+            return None
+        personas = set(personas) if personas else None
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+        return dict.fromkeys(
+            session_id for session_id, session in reversed(self.sessions.items())
+            if (personas is None or session["persona"] in personas)
+            and (start is None or session["date"] >= start)
+            and (end is None or session["date"] <= end)
+            and (min_score is None or (session["score"] is not None and session["score"] >= min_score))
+        )
+
+    def _filter(self, message_ids, allowed, role):
+        """Lazily yield the message ids that pass the session and role filters."""
+        messages = self.messages
+        return (mid for mid in message_ids
+                if (allowed is None or messages[mid][0] in allowed)
+                and (role is None or messages[mid][1] == role))
+
+    def search(self, query, mode="keyword", personas=None, start_date=None, end_date=None,
+               min_score=None, role=None, limit=50):
+        """Return up to `limit` (score, message_id) pairs, best first."""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        with self._lock:
+            allowed = self._allowed_sessions(personas, start_date, end_date, min_score)
+            if allowed is not None and not allowed:
+                return []
+            if mode == "similar wording" and self.similar_wording:
+                return self._similar_wording_search(terms, allowed, role, limit)
+            return self._keyword_search(terms, allowed, role, limit)
+
+    def _keyword_search(self, terms, allowed, role, limit):
+        """Rank by matched query terms, then tf-idf, pruning common terms.
+
+        Terms in over half the messages are dropped when the query has others.
+        Terms in more than COMMON_TERM_POSTINGS messages only re-rank matches
+        found by rarer terms; if every term is that common, only the most
+        recent matches are scored.
+        """
+        posting_lists = [self.postings[term] for term in set(terms) if term in self.postings]
+        if not posting_lists:
+            return []
+        total = len(self.messages)
+        # Near-stopwords ("the", "to") barely move the ranking but cost the most to score
+        informative = [postings for postings in posting_lists if len(postings) <= total * STOPWORD_FRACTION]
+        posting_lists = informative or posting_lists
+        idf = [math.log(1 + total / len(postings)) for postings in posting_lists]
+        rare = [postings for postings in posting_lists if len(postings) <= COMMON_TERM_POSTINGS]
+        if rare:
+            candidates = set(self._filter(set().union(*rare), allowed, role))
+        elif allowed is not None and self._scan_is_cheaper(allowed, posting_lists):
+            # Few sessions pass the filters: read their messages newest first instead
+            messages = (mid for session_id in allowed for mid in reversed(self.session_messages.get(session_id, ())))
+            candidates = set(islice(self._filter(messages, None, role), COMMON_TERM_CANDIDATES * len(posting_lists)))
+        else:
+            candidates = set()
+            for postings in posting_lists:
+                # Postings are in message order, so walk them newest first
+                candidates.update(islice(self._filter(reversed(postings), allowed, role), COMMON_TERM_CANDIDATES))
+        matched, scores = defaultdict(int), defaultdict(float)
+        for postings, weight in zip(posting_lists, idf):
+            for mid in postings.keys() & candidates:
+                matched[mid] += 1
+                scores[mid] += postings[mid] * weight
+        top = heapq.nlargest(limit, matched, key=lambda mid: (matched[mid], scores[mid], mid))
+        # Matched term count plus a tf-idf tie-break below 1, so the score follows the rank
+        return [(matched[mid] + scores[mid] / (1 + scores[mid]), mid) for mid in top]
+
+    def _scan_is_cheaper(self, allowed, posting_lists):
+        """Compare reading the allowed sessions' messages with walking postings past filtered-out ones."""
+        allowed_messages = sum(len(self.session_messages.get(session_id, ())) for session_id in allowed)
+        if not allowed_messages:
+            return True
+        walk_per_term = COMMON_TERM_CANDIDATES * len(self.messages) / allowed_messages
+        return allowed_messages < sum(min(len(postings), walk_per_term) for postings in posting_lists)
+
+    def _similar_wording_search(self, terms, allowed, role, limit):
+        query = self._hash_vector(terms)
+        bucket = self._bucket(query)
+        # Probe the query bucket and its one-bit neighbours
+        candidates = list(self._buckets.get(bucket, []))
+        for bit in range(LSH_PLANES):
+            candidates.extend(self._buckets.get(bucket ^ (1 << bit), []))
+        candidates = list(self._filter(set(candidates), allowed, role))
+        if not candidates:
+            return []
+        ids = np.asarray(candidates)
+        scores = self._vectors[ids] @ query
+        top = np.argsort(-scores)[:limit]
+        return [(float(scores[i]), int(ids[i])) for i in top if scores[i] > 0]
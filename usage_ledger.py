@@ -0,0 +1,55 @@
+"""
+AI Healthcare Coaching Platform - Usage Ledger
+Model call records and per-tenant monthly spend, rebuilt from the session event log.
+Kept free of Streamlit and pandas so it can be tested directly.
+"""
+
+import threading
+from datetime import datetime
+from collections import defaultdict
+
+TENANT_MONTHLY_BUDGETS = {"demo-pharma": 50.00}  # USD; model calls stop once a tenant reaches it
+BUDGET_SOFT_LIMIT_FRACTION = 0.8  # past this share of the budget every call goes to the fast tier
+
+LEDGER_COLUMNS = [
+    'ts', 'session_id', 'rep', 'team', 'tenant', 'persona', 'function',
+    'tier', 'model', 'input_tokens', 'output_tokens', 'cost', 'latency_ms', 'turn_latency_ms'
+]
+
+class UsageLedger:
+    """Model call records rebuilt from, and kept current by, the event log."""
+
+    def __init__(self, budgets=TENANT_MONTHLY_BUDGETS, soft_limit_fraction=BUDGET_SOFT_LIMIT_FRACTION):
+        self.budgets = budgets
+        self.soft_limit_fraction = soft_limit_fraction
+        self._lock = threading.Lock()
+        self.records = []
+        self._tenant_spend = defaultdict(float)  # (tenant, 'YYYY-MM') -> USD
+
+    def add_event(self, event):
+        if event["type"] != "model_call":
+            return
+        record = dict(event["payload"], session_id=event["session_id"], ts=event["ts"])
+        with self._lock:
+            self.records.append(record)
+            self._tenant_spend[(record["tenant"], record["ts"][:7])] += record["cost"]
+
+    def tenant_spend(self, tenant, month=None):
+        return self._tenant_spend.get((tenant, month or datetime.now().strftime("%Y-%m")), 0.0)
+
+    def budget_status(self, tenant, month=None):
+        """'ok', 'soft' (past the soft limit: fast tier only) or 'blocked' (budget used up)."""
+        budget = self.budgets.get(tenant)
+        if budget is None:
+            return "ok"
+        spend = self.tenant_spend(tenant, month)
+        if spend >= budget:
+            return "blocked"
+        if spend >= budget * self.soft_limit_fraction:
+            return "soft"
+        return "ok"
+
+    def snapshot(self):
+        """Copy of the records, safe to read while new calls are being added."""
+        with self._lock:
+            return list(self.records)
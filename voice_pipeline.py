@@ -0,0 +1,137 @@
+"""
+AI Healthcare Coaching Platform - Voice Pipeline
+Streaming local speech-to-text (Vosk) and text-to-speech (pyttsx3) for voice role-play.
+Kept free of Streamlit so it can be driven by recorded audio fixtures in the benchmarks.
+"""
+
+import io
+import os
+import re
+import json
+import wave
+import tempfile
+import threading
+
+try:
+    import vosk
+except ImportError:  # voice mode is optional
+    vosk = None
+
+try:
+    import pyttsx3
+except ImportError:  # spoken persona replies are optional
+    pyttsx3 = None
+
+VOSK_MODEL_PATH = os.environ.get("VOSK_MODEL_PATH", "models/vosk-model-small-en-us-0.15")
+VOICE_CHUNK_MS = 200
+PARTIAL_STABLE_RUNS = 2
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+_synthesizer_lock = threading.Lock()
+
+def load_speech_model(path=VOSK_MODEL_PATH):
+    """Return a Vosk model, or None when vosk or the model directory is missing."""
+    if vosk is None or not os.path.isdir(path):
+        return None
+    vosk.SetLogLevel(-1)
+    return vosk.Model(path)
+
+def load_speech_synthesizer():
+    """Return a pyttsx3 engine, or None when no speech engine is available."""
+    if pyttsx3 is None:
+        return None
+    try:
+        return pyttsx3.init()
+    except (ImportError, OSError, RuntimeError):  # no speech driver installed
+        return None
+
+def iter_wav_chunks(wav_bytes, chunk_ms=VOICE_CHUNK_MS):
+    """Yield (sample_rate, pcm_chunk) from a 16-bit mono WAV recording."""
+    with wave.open(io.BytesIO(wav_bytes)) as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError("Voice mode expects 16-bit mono WAV audio")
+        sample_rate = wav.getframerate()
+        frames_per_chunk = max(1, sample_rate * chunk_ms // 1000)
+        while True:
+            chunk = wav.readframes(frames_per_chunk)
+            if not chunk:
+                break
+            yield sample_rate, chunk
+
+def wav_duration(wav_bytes):
+    with wave.open(io.BytesIO(wav_bytes)) as wav:
+        return wav.getnframes() / wav.getframerate()
+
+class PartialStabilizer:
+    """Track recognizer hypotheses and report words once they stop changing.
+
+    A partial word is stable when it has stayed the same in `runs`
+    consecutive hypotheses. Finalized results reset the partial history.
+    """
+
+    def __init__(self, runs=PARTIAL_STABLE_RUNS):
+        self.runs = runs
+        self.final_words = []
+        self.stable_words = []
+        self.hypotheses = []
+
+    @property
+    def text(self):
+        return " ".join(self.final_words + self.stable_words)
+
+    def partial(self, words):
+        """Add a partial hypothesis; return True if more words became stable."""
+        self.hypotheses = (self.hypotheses + [words])[-self.runs:]
+        if len(self.hypotheses) < self.runs:
+            return False
+        prefix = os.path.commonprefix(self.hypotheses)
+        if len(prefix) <= len(self.stable_words):
+            return False
+        self.stable_words = prefix
+        return True
+
+    def final(self, words):
+        """Commit a finalized utterance segment."""
+        self.final_words += words
+        self.stable_words = []
+        self.hypotheses = []
+
+def transcribe_stream(wav_bytes, model, chunk_ms=VOICE_CHUNK_MS):
+    """Feed a 16-bit mono WAV recording to the recognizer chunk by chunk.
+
+    Yields (text, is_final). Partial words are only emitted once they have
+    stayed the same for PARTIAL_STABLE_RUNS consecutive hypotheses. Callers
+    get the stabilized text for display; nothing here starts a reply early.
+    """
+    stabilizer = PartialStabilizer()
+    recognizer = None
+    for sample_rate, chunk in iter_wav_chunks(wav_bytes, chunk_ms):
+        if recognizer is None:
+            recognizer = vosk.KaldiRecognizer(model, sample_rate)
+        if recognizer.AcceptWaveform(chunk):
+            stabilizer.final(json.loads(recognizer.Result())["text"].split())
+            yield stabilizer.text, False
+        elif stabilizer.partial(json.loads(recognizer.PartialResult())["partial"].split()):
+            yield stabilizer.text, False
+    if recognizer is not None:
+        stabilizer.final(json.loads(recognizer.FinalResult())["text"].split())
+    yield stabilizer.text, True
+
+def synthesize_stream(text, engine):
+    """Yield WAV bytes one sentence at a time so playback can start early.
+
+    The generator is lazy: the next sentence is only synthesized when the
+    caller asks for it, so it overlaps with playback of the previous one.
+    The shared engine is locked per sentence, never while a clip is yielded.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for idx, sentence in enumerate(SENTENCE_PATTERN.split(text.strip())):
+            if not sentence:
+                continue
+            path = os.path.join(tmp_dir, f"sentence-{idx}.wav")
+            with _synthesizer_lock:
+                engine.save_to_file(sentence, path)
+                engine.runAndWait()
+                with open(path, "rb") as f:
+                    clip = f.read()
+            yield clip